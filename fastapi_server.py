@@ -7,7 +7,9 @@ from typing import Dict, Optional, Any, List
 import uvicorn
 import json
 import os
-from datetime import datetime
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
 
 # Initialize FastAPI app
 app = FastAPI(title="Island Content API", docs_url=None, redoc_url=None)
@@ -24,6 +26,14 @@ app.add_middleware(
 # Path to the shared data file
 ISLANDS_FILE = 'islands.json'
 
+# In-memory metadata index: island_id -> {name, updated_at, content_length,
+# content_hash, representations}. Lets HEAD requests answer without reading
+# island content. island_index_stamp holds the (st_mtime_ns, st_size) of
+# islands.json the index was built from; the index is rebuilt whenever that
+# changes on disk (the Streamlit app writes the same file directly).
+island_index = {}
+island_index_stamp = None
+
 # Models for API requests
 class IslandCreate(BaseModel):
     name: str
@@ -35,31 +45,143 @@ class IslandUpdate(BaseModel):
 class IslandData(BaseModel):
     islands: Dict[str, Any]
 
+# Normalize a single island, migrating the old notes format. Returns None
+# for entries that are not islands at all.
+def normalize_island(island):
+    if not isinstance(island, dict):
+        return None
+
+    # Check for old format and migrate if needed
+    if 'content' not in island and isinstance(island.get('notes'), list):
+        island['content'] = "\n".join([
+            str(note.get('content', '')) for note in island['notes'] if isinstance(note, dict)
+        ])
+
+    for field in ('name', 'content'):
+        value = island.get(field)
+        island[field] = "" if value is None else str(value)
+
+    # No timestamp is invented here, so Last-Modified is only ever sent
+    # for islands that really have one
+    if 'updated_at' not in island and 'created_at' in island:
+        island['updated_at'] = island['created_at']
+
+    return island
+
+# Normalize all islands, dropping entries that are not islands
+def normalize_islands(islands):
+    normalized = {}
+    for island_id, island in islands.items():
+        island = normalize_island(island)
+        if island is not None:
+            normalized[island_id] = island
+    return normalized
+
 # Function to load islands from file
 def load_islands():
     if os.path.exists(ISLANDS_FILE):
         with open(ISLANDS_FILE, 'r') as f:
-            islands_data = json.load(f)
-            # Check for old format and migrate if needed
-            for island_id, island in islands_data.items():
-                if 'content' not in island and 'notes' in island:
-                    notes_content = "\n".join([note.get('content', '') for note in island.get('notes', [])])
-                    island['content'] = notes_content
-
-                if 'content' not in island:
-                    island['content'] = ""
-
-                if 'updated_at' not in island:
-                    island['updated_at'] = island.get('created_at', datetime.now().isoformat())
-
-            return islands_data
+            return normalize_islands(json.load(f))
     return {}
 
-# Function to save islands to file
-def save_islands(islands):
+# Function to save islands to file. Pass changed_id when only one island
+# was created, updated or deleted so just its index entry is refreshed.
+def save_islands(islands, changed_id=None):
+    islands = normalize_islands(islands)
+    index_current = get_islands_file_stamp() == island_index_stamp
+
     with open(ISLANDS_FILE, 'w') as f:
         json.dump(islands, f)
 
+    if changed_id is None or not index_current:
+        rebuild_island_index(islands)
+    else:
+        update_island_index(islands, changed_id)
+
+# Get the (mtime, size) stamp of the data file, or None if it does not exist
+def get_islands_file_stamp():
+    try:
+        stat = os.stat(ISLANDS_FILE)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+# Hash an island's name and content; used to build ETags
+def island_content_hash(island):
+    return hashlib.sha256(
+        f"{island['name']}\0{island['content']}".encode("utf-8")
+    ).hexdigest()[:32]
+
+# ETag for one representation of an island
+def island_etag(content_hash, kind):
+    return f'"{content_hash}-{kind}"'
+
+# Build the metadata entry for a single island
+def build_index_entry(island):
+    content = island["content"]
+    content_hash = island_content_hash(island)
+
+    bodies = {
+        "html": render_island_html(island),
+        "text": render_island_text(island),
+        "json": render_island_json(island),
+    }
+
+    return {
+        "name": island["name"],
+        "updated_at": island.get("updated_at"),
+        "content_length": len(content.encode("utf-8")),
+        "content_hash": content_hash,
+        "representations": {
+            kind: {
+                "content_length": len(body),
+                "etag": island_etag(content_hash, kind)
+            }
+            for kind, body in bodies.items()
+        }
+    }
+
+# Rebuild the metadata index from (normalized) islands data
+def rebuild_island_index(islands):
+    global island_index, island_index_stamp
+    island_index = {
+        island_id: build_index_entry(island)
+        for island_id, island in islands.items()
+    }
+    island_index_stamp = get_islands_file_stamp()
+
+# Refresh the index entry of a single island after the API saved it
+def update_island_index(islands, island_id):
+    global island_index_stamp
+    island_index.pop(island_id, None)
+    if island_id in islands:
+        island_index[island_id] = build_index_entry(islands[island_id])
+    island_index_stamp = get_islands_file_stamp()
+
+# Get the metadata index, reloading it only if the data file has changed
+def get_island_index():
+    if get_islands_file_stamp() != island_index_stamp:
+        rebuild_island_index(load_islands())
+    return island_index
+
+# Format an island's updated_at timestamp as an HTTP date
+def format_http_date(timestamp):
+    if not timestamp:
+        return None
+    try:
+        dt = datetime.fromisoformat(timestamp)
+    except (TypeError, ValueError):
+        return None
+    return format_datetime(dt.astimezone(timezone.utc), usegmt=True)
+
+# Caching headers for one representation of an island
+def island_cache_headers(content_hash, updated_at, kind):
+    headers = {"ETag": island_etag(content_hash, kind)}
+    last_modified = format_http_date(updated_at)
+    if last_modified:
+        headers["Last-Modified"] = last_modified
+    return headers
+
 # Basic HTML wrapper for content
 def html_wrapper(title, body_content):
     return f"""<!DOCTYPE html>
@@ -73,6 +195,83 @@ def html_wrapper(title, body_content):
 </body>
 </html>"""
 
+# Bodies sent by the island routes when the island does not exist
+ISLAND_NOT_FOUND_BODIES = {
+    "html": html_wrapper(
+        "Island Not Found",
+        "<h1>Island Not Found</h1><p>The requested island does not exist.</p>"
+    ).encode("utf-8"),
+    "text": b"Island not found",
+    "json": b'{"detail":"Island not found"}',
+}
+
+# Render the HTML page for an island
+def render_island_html(island):
+    name = island["name"]
+    content = island["content"]
+
+    # Convert line breaks to <br> tags for proper HTML display
+    formatted_content = content.replace('\n', '<br>\n')
+
+    body_content = f"""
+    <h1>Island: {name}</h1>
+    <div>{formatted_content}</div>
+    """
+
+    return html_wrapper(f"Island: {name}", body_content).encode("utf-8")
+
+# Render the plain text version of an island
+def render_island_text(island):
+    return f"Island: {island['name']}\n\n{island['content']}".encode("utf-8")
+
+# Render the JSON version of an island (same encoding as JSONResponse)
+def render_island_json(island):
+    return json.dumps(
+        {
+            "island_name": island["name"],
+            "content": island["content"]
+        },
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+# Answer a HEAD request for an island from the metadata index alone
+def island_head_response(island_id, kind, media_type):
+    index = get_island_index()
+
+    if island_id not in index:
+        return Response(
+            status_code=404,
+            headers={
+                "Content-Type": media_type,
+                "Content-Length": str(len(ISLAND_NOT_FOUND_BODIES[kind])),
+            }
+        )
+
+    entry = index[island_id]
+    headers = {
+        "Content-Type": media_type,
+        "Content-Length": str(entry["representations"][kind]["content_length"]),
+    }
+    headers.update(island_cache_headers(entry["content_hash"], entry["updated_at"], kind))
+
+    return Response(status_code=200, headers=headers)
+
+# HEAD for island pages; registered before the catch-all HEAD route
+@app.head("/api/islands/{island_id}")
+async def head_island_content(island_id: str):
+    return island_head_response(island_id, "html", "text/html; charset=utf-8")
+
+@app.head("/api/islands/{island_id}/text")
+async def head_island_content_text(island_id: str):
+    return island_head_response(island_id, "text", "text/plain; charset=utf-8")
+
+@app.head("/api/json/islands/{island_id}")
+async def head_island_content_json(island_id: str):
+    return island_head_response(island_id, "json", "application/json")
+
 # Handle both GET and HEAD methods for all routes
 @app.api_route("/{full_path:path}", methods=["HEAD"])
 async def head_route(full_path: str):
@@ -147,31 +346,21 @@ async def get_island_content(island_id: str):
     islands = load_islands()
 
     if island_id not in islands:
-        not_found_content = html_wrapper(
-            "Island Not Found",
-            "<h1>Island Not Found</h1><p>The requested island does not exist.</p>"
-        )
         return HTMLResponse(
-            content=not_found_content,
+            content=ISLAND_NOT_FOUND_BODIES["html"],
             status_code=404,
             headers={"Content-Type": "text/html; charset=utf-8"}
         )
 
     island = islands[island_id]
-    content = island.get("content", "")
-
-    # Convert line breaks to <br> tags for proper HTML display
-    formatted_content = content.replace('\n', '<br>\n')
+    headers = {"Content-Type": "text/html; charset=utf-8"}
+    headers.update(island_cache_headers(
+        island_content_hash(island), island.get("updated_at"), "html"
+    ))
 
-    body_content = f"""
-    <h1>Island: {island["name"]}</h1>
-    <div>{formatted_content}</div>
-    """
-
-    html_content = html_wrapper(f"Island: {island['name']}", body_content)
     return HTMLResponse(
-        content=html_content,
-        headers={"Content-Type": "text/html; charset=utf-8"}
+        content=render_island_html(island),
+        headers=headers
     )
 
 # Plain text version of island content
@@ -181,17 +370,20 @@ async def get_island_content_text(island_id: str):
 
     if island_id not in islands:
         return PlainTextResponse(
-            content="Island not found",
+            content=ISLAND_NOT_FOUND_BODIES["text"],
             status_code=404,
             headers={"Content-Type": "text/plain; charset=utf-8"}
         )
 
     island = islands[island_id]
-    content = island.get("content", "")
+    headers = {"Content-Type": "text/plain; charset=utf-8"}
+    headers.update(island_cache_headers(
+        island_content_hash(island), island.get("updated_at"), "text"
+    ))
 
     return PlainTextResponse(
-        content=f"Island: {island['name']}\n\n{content}",
-        headers={"Content-Type": "text/plain; charset=utf-8"}
+        content=render_island_text(island),
+        headers=headers
     )
 
 # Get island content in JSON format
@@ -203,13 +395,14 @@ async def get_island_content_json(island_id: str):
         raise HTTPException(status_code=404, detail="Island not found")
 
     island = islands[island_id]
+    headers = {"Content-Type": "application/json"}
+    headers.update(island_cache_headers(
+        island_content_hash(island), island.get("updated_at"), "json"
+    ))
 
-    return JSONResponse(
-        content={
-            "island_name": island["name"],
-            "content": island.get("content", "")
-        },
-        headers={"Content-Type": "application/json"}
+    return Response(
+        content=render_island_json(island),
+        headers=headers
     )
 
 # Create a new island
@@ -229,7 +422,7 @@ async def create_island(island: IslandCreate):
         "updated_at": datetime.now().isoformat()
     }
 
-    save_islands(islands)
+    save_islands(islands, island_id)
 
     return JSONResponse(
         content={
@@ -257,7 +450,7 @@ async def update_island(island_id: str, update_data: IslandUpdate):
     # Update the timestamp
     islands[island_id]["updated_at"] = datetime.now().isoformat()
 
-    save_islands(islands)
+    save_islands(islands, island_id)
 
     return JSONResponse(
         content={
@@ -281,7 +474,7 @@ async def delete_island(island_id: str):
     # Delete the island
     del islands[island_id]
 
-    save_islands(islands)
+    save_islands(islands, island_id)
 
     return JSONResponse(
         content={
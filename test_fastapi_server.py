@@ -0,0 +1,103 @@
+# test_fastapi_server.py
+# Run with: pip install -r requirements-dev.txt && python -m pytest
+import pytest
+from fastapi.testclient import TestClient
+
+import fastapi_server
+
+ISLAND_PATHS = [
+    "/api/islands/{}",
+    "/api/islands/{}/text",
+    "/api/json/islands/{}",
+]
+
+# Point the server at an empty data file and reset the metadata index
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(fastapi_server, "ISLANDS_FILE", str(tmp_path / "islands.json"))
+    monkeypatch.setattr(fastapi_server, "island_index", {})
+    monkeypatch.setattr(fastapi_server, "island_index_stamp", None)
+    return TestClient(fastapi_server.app)
+
+def create_island(client, name, content):
+    island_id = client.post("/api/islands/create", json={"name": name}).json()["id"]
+    client.post(f"/api/islands/{island_id}/update", json={"content": content})
+    return island_id
+
+# Check that HEAD reports the same status and headers as GET
+def assert_head_matches_get(client, island_id):
+    for path in ISLAND_PATHS:
+        get = client.get(path.format(island_id))
+        head = client.head(path.format(island_id))
+
+        assert head.status_code == get.status_code
+        assert head.headers["content-length"] == str(len(get.content))
+        assert head.headers.get("etag") == get.headers.get("etag")
+        assert head.headers.get("last-modified") == get.headers.get("last-modified")
+
+# HEAD reports the same status, length and ETag as GET
+def test_head_matches_get(client):
+    island_id = create_island(client, "Island", "héllo\nworld")
+
+    assert_head_matches_get(client, island_id)
+    assert_head_matches_get(client, "missing")
+
+# Updating one island changes its ETag and leaves the others alone
+def test_update_refreshes_index(client):
+    first_id = create_island(client, "First", "a")
+    second_id = create_island(client, "Second", "b")
+    first_etag = client.head(f"/api/islands/{first_id}").headers["etag"]
+    second_etag = client.head(f"/api/islands/{second_id}").headers["etag"]
+
+    client.post(f"/api/islands/{first_id}/update", json={"content": "changed"})
+
+    assert client.head(f"/api/islands/{first_id}").headers["etag"] != first_etag
+    assert client.head(f"/api/islands/{second_id}").headers["etag"] == second_etag
+
+    client.delete(f"/api/islands/{first_id}/delete")
+
+    assert client.head(f"/api/islands/{first_id}").status_code == 404
+
+# A malformed island from sync does not break the other islands
+def test_sync_malformed_island(client):
+    island_id = create_island(client, "Island", "content")
+    islands = fastapi_server.load_islands()
+    islands["no-name"] = {"content": "a"}
+    islands["null-content"] = {"name": "Empty", "content": None}
+    islands["number-content"] = {"name": 7, "content": 42}
+    islands["not-a-dict"] = "island"
+
+    response = client.post("/api/islands/sync", json={"islands": islands})
+    assert response.status_code == 200
+
+    for path in ISLAND_PATHS:
+        assert client.get(path.format(island_id)).status_code == 200
+
+    for target in (island_id, "no-name", "null-content", "number-content", "not-a-dict"):
+        assert_head_matches_get(client, target)
+
+    assert client.get("/api/islands/not-a-dict").status_code == 404
+
+# Old notes-format islands are migrated the same way for HEAD and GET
+def test_sync_notes_format(client):
+    islands = {
+        "notes": {
+            "name": "A",
+            "notes": [{"content": "hello"}, {"content": "x"}],
+            "created_at": "2025-03-11T18:07:39.577232"
+        }
+    }
+
+    client.post("/api/islands/sync", json={"islands": islands})
+
+    assert client.get("/api/islands/notes/text").text == "Island: A\n\nhello\nx"
+    assert_head_matches_get(client, "notes")
+
+# Islands without any timestamp get no Last-Modified header
+def test_no_timestamp_no_last_modified(client):
+    client.post("/api/islands/sync", json={"islands": {"bare": {"name": "B", "content": "c"}}})
+
+    for path in ISLAND_PATHS:
+        assert "last-modified" not in client.get(path.format("bare")).headers
+        assert "last-modified" not in client.head(path.format("bare")).headers
+    assert_head_matches_get(client, "bare")